@@ -7,6 +7,7 @@ Required environment variables:
   NOCODB_TABLE_COURSES     - Table ID for Courses
   NOCODB_TABLE_ENROLLMENTS - Table ID for enrollments
 """
+import asyncio
 import os
 import httpx
 import logging
@@ -31,6 +32,43 @@ TABLE_MAP = {
 
 class NocoDBClient:
 
+    def __init__(self):
+        self._client = None
+        self._client_loop = None
+
+    async def _http(self) -> httpx.AsyncClient:
+        """
+        Shared, bounded connection pool so requests reuse open TCP/TLS
+        connections to NocoDB. Recreated if the running event loop changes
+        (e.g. a fresh loop per serverless invocation); the old pool is closed
+        so its connections aren't left open.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # Swap before awaiting so concurrent callers share the new pool
+            stale, self._client = self._client, httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+            self._client_loop = loop
+            if stale is not None:
+                await self._close_stale(stale)
+        return self._client
+
+    @staticmethod
+    async def _close_stale(client: httpx.AsyncClient):
+        # Its connections belong to the previous loop, which may already be
+        # closed; close what can be closed and let the rest be collected
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Closing stale NocoDB client: {e}")
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def _token(self) -> str:
         t = os.environ.get('NOCODB_TOKEN', '')
         if not t:
@@ -55,45 +93,49 @@ class NocoDBClient:
         return f"{BASE}/{table_id}/records"
 
     async def get_all(self, table_name: str, params: dict = None):
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(self._url(table_name),
-                headers=self._headers(), params=params)
-            if response.status_code != 200:
-                logger.error(f"NocoDB Error ({response.status_code}): {response.text}")
-                return []
-            return response.json().get('list', [])
-
-    async def find_one(self, table_name: str, where_clause: str):
-        """where_clause example: '(email,eq,test@test.com)'"""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(self._url(table_name),
-                headers=self._headers(),
-                params={"where": where_clause, "limit": 1})
-            if response.status_code != 200:
-                logger.error(f"NocoDB Error ({response.status_code}): {response.text}")
-                return None
-            results = response.json().get('list', [])
-            return results[0] if results else None
+        http = await self._http()
+        response = await http.get(self._url(table_name),
+            headers=self._headers(), params=params)
+        if response.status_code != 200:
+            logger.error(f"NocoDB Error ({response.status_code}): {response.text}")
+            return []
+        return response.json().get('list', [])
+
+    async def find_one(self, table_name: str, where_clause: str, fields: str = None):
+        """
+        where_clause example: '(email,eq,test@test.com)'
+        fields: optional comma-separated column list to fetch, e.g. 'Id,email'
+        """
+        params = {"where": where_clause, "limit": 1}
+        if fields:
+            params["fields"] = fields
+        http = await self._http()
+        response = await http.get(self._url(table_name),
+            headers=self._headers(), params=params)
+        if response.status_code != 200:
+            logger.error(f"NocoDB Error ({response.status_code}): {response.text}")
+            return None
+        results = response.json().get('list', [])
+        return results[0] if results else None
 
     async def insert_one(self, table_name: str, data: dict):
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(self._url(table_name),
-                headers=self._headers(), json=data)
-            if response.status_code not in [200, 201]:
-                logger.error(f"NocoDB Insert Error ({response.status_code}): {response.text}")
-                raise Exception(f"Failed to insert into {table_name}: {response.text}")
-            return response.json()
+        http = await self._http()
+        response = await http.post(self._url(table_name),
+            headers=self._headers(), json=data)
+        if response.status_code not in [200, 201]:
+            logger.error(f"NocoDB Insert Error ({response.status_code}): {response.text}")
+            raise Exception(f"Failed to insert into {table_name}: {response.text}")
+        return response.json()
 
     async def update_by_id(self, table_name: str, row_id: int, data: dict):
         payload = {"Id": row_id, **data}
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.patch(
-                self._url(table_name),
-                headers=self._headers(), json=payload)
-            if response.status_code not in [200, 201]:
-                logger.error(f"NocoDB Update Error ({response.status_code}): {response.text}")
-                raise Exception(f"Failed to update {table_name}: {response.text}")
-            return response.json()
-
+        http = await self._http()
+        response = await http.patch(
+            self._url(table_name),
+            headers=self._headers(), json=payload)
+        if response.status_code not in [200, 201]:
+            logger.error(f"NocoDB Update Error ({response.status_code}): {response.text}")
+            raise Exception(f"Failed to update {table_name}: {response.text}")
+        return response.json()
 
 noco = NocoDBClient()
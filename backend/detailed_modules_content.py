@@ -1,158 +1,227 @@
 # Detailed teaching content for ETT Foundational Course modules
 # This content will be integrated into the existing modules
+#
+# Each module is a frozen, slotted Module record; MODULES is the tuple of all
+# of them in order and DETAILED_MODULES maps module_number -> Module.
+# Everything here is immutable (frozen records, tuples, read-only mappings),
+# so callers can share the returned objects without copying them.
+# The content is built on first access (get_module() or either attribute)
+# rather than at import time, so importers that never read it don't pay for
+# allocating it.
+#
+# The long text fields are intentionally stored uncompressed: together they
+# are about 3 KB, and the literals stay resident in _build()'s code object
+# anyway, so keeping compressed copies would add memory rather than save it.
+import sys
+from dataclasses import dataclass, fields
+from functools import cache
+from types import MappingProxyType
 
-DETAILED_MODULES = {
-    1: {
-        "concept_explanation": """Trauma is not defined by the event itself, but by how the nervous system responds to the event. When an individual experiences something overwhelming, the brain may fail to process the experience properly, leading to stored emotional and physiological responses.
+
+@dataclass(frozen=True, slots=True)
+class Exercise:
+    name: str
+    type: str
+    instructions: str
+    duration: str
+    outcome: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Module:
+    module_number: int
+    concept_explanation: str
+    instructor_script: str
+    student_activities: tuple[str, ...]
+    exercises: tuple[Exercise, ...]
+    expected_outcome: str
+
+
+def _ex(name, type, instructions, duration, outcome=None):
+    # type and duration are drawn from a small set of short values; intern
+    # them so every exercise shares one string object per value.
+    return Exercise(name, sys.intern(type), instructions, sys.intern(duration), outcome)
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(Module))
+
+
+@cache
+def _build() -> tuple[Module, ...]:
+    return (
+        Module(
+            module_number=1,
+            concept_explanation="""Trauma is not defined by the event itself, but by how the nervous system responds to the event. When an individual experiences something overwhelming, the brain may fail to process the experience properly, leading to stored emotional and physiological responses.
 
 There are three primary types of trauma:
 • Acute Trauma: Resulting from a single distressing event (e.g., accident)
 • Chronic Trauma: Repeated exposure (e.g., ongoing stress or abuse)
 • Complex Trauma: Deep, layered trauma often from early life experiences""",
-        "instructor_script": "Trauma is not what happens to you — it's what happens inside you as a result of what happened. Two people can go through the same event, and only one may develop trauma.",
-        "student_activities": [
-            "Reflect on a stressful experience (non-triggering)",
-            "Identify: What happened?",
-            "Identify: What did you feel in your body?",
-            "Identify: What thoughts came up?"
-        ],
-        "exercises": [
-            {
-                "name": "Trauma Reflection Exercise",
-                "type": "self-reflection",
-                "instructions": "Think of a mildly stressful experience (not traumatic). Write down what happened, what you felt in your body, and what thoughts arose.",
-                "duration": "10 minutes"
-            }
-        ],
-        "expected_outcome": "Students understand trauma as a nervous system response, not just an event."
-    },
-    2: {
-        "concept_explanation": """The nervous system operates in two main modes:
+            instructor_script="Trauma is not what happens to you — it's what happens inside you as a result of what happened. Two people can go through the same event, and only one may develop trauma.",
+            student_activities=(
+                "Reflect on a stressful experience (non-triggering)",
+                "Identify: What happened?",
+                "Identify: What did you feel in your body?",
+                "Identify: What thoughts came up?",
+            ),
+            exercises=(
+                _ex("Trauma Reflection Exercise",
+                    "self-reflection",
+                    "Think of a mildly stressful experience (not traumatic). Write down what happened, what you felt in your body, and what thoughts arose.",
+                    "10 minutes"),
+            ),
+            expected_outcome="Students understand trauma as a nervous system response, not just an event.",
+        ),
+        Module(
+            module_number=2,
+            concept_explanation="""The nervous system operates in two main modes:
 • Sympathetic: Fight or Flight (activation)
 • Parasympathetic: Rest and Digest (calm state)
 
 When trauma occurs, the system may get stuck in activation or shutdown. Understanding nervous system regulation is key to emotional transformation.""",
-        "instructor_script": "Your body is always trying to protect you. Even anxiety is not the enemy — it is a signal that your nervous system is responding to perceived threat.",
-        "student_activities": [
-            "Practice grounding technique",
-            "Observe physiological responses",
-            "Notice emotional shifts during exercise"
-        ],
-        "exercises": [
-            {
-                "name": "5-4-3-2-1 Grounding Practice",
-                "type": "experiential",
-                "instructions": "Look around and name 5 things you see, identify 4 things you can touch, notice 3 sounds, observe 2 smells, take 1 deep breath",
-                "duration": "5 minutes",
-                "outcome": "Immediate nervous system regulation"
-            }
-        ],
-        "expected_outcome": "Students experience immediate nervous system regulation and understand the two primary nervous system modes."
-    },
-    3: {
-        "concept_explanation": """Emotional Transformation Therapy (ETT) works by influencing the brain's emotional centers using light and sensory input to rapidly shift emotional states.
+            instructor_script="Your body is always trying to protect you. Even anxiety is not the enemy — it is a signal that your nervous system is responding to perceived threat.",
+            student_activities=(
+                "Practice grounding technique",
+                "Observe physiological responses",
+                "Notice emotional shifts during exercise",
+            ),
+            exercises=(
+                _ex("5-4-3-2-1 Grounding Practice",
+                    "experiential",
+                    "Look around and name 5 things you see, identify 4 things you can touch, notice 3 sounds, observe 2 smells, take 1 deep breath",
+                    "5 minutes",
+                    "Immediate nervous system regulation"),
+            ),
+            expected_outcome="Students experience immediate nervous system regulation and understand the two primary nervous system modes.",
+        ),
+        Module(
+            module_number=3,
+            concept_explanation="""Emotional Transformation Therapy (ETT) works by influencing the brain's emotional centers using light and sensory input to rapidly shift emotional states.
 
 Key Idea: Emotion is not fixed — it can be altered through neurological pathways. ETT uses visual stimulation and specific techniques to access and transform stuck emotional patterns.""",
-        "instructor_script": "Instead of trying to think your way out of emotions, ETT works directly with the brain's processing centers. We're engaging the neurology of emotion, not just the psychology.",
-        "student_activities": [
-            "Observe emotional shifts during guided visualization",
-            "Notice physical sensations with different colors/light",
-            "Track emotional changes in real-time"
-        ],
-        "exercises": [
-            {
-                "name": "Color Visualization Exercise",
-                "type": "guided_practice",
-                "instructions": "Close your eyes and visualize different colors. Notice how each color affects your emotional state. Start with calming blue, then energizing yellow, then grounding green.",
-                "duration": "15 minutes"
-            }
-        ],
-        "expected_outcome": "Students experience how sensory input can directly influence emotional states."
-    },
-    4: {
-        "concept_explanation": """Before transformation, awareness is required. Many individuals are disconnected from their emotional states. Emotional awareness involves:
+            instructor_script="Instead of trying to think your way out of emotions, ETT works directly with the brain's processing centers. We're engaging the neurology of emotion, not just the psychology.",
+            student_activities=(
+                "Observe emotional shifts during guided visualization",
+                "Notice physical sensations with different colors/light",
+                "Track emotional changes in real-time",
+            ),
+            exercises=(
+                _ex("Color Visualization Exercise",
+                    "guided_practice",
+                    "Close your eyes and visualize different colors. Notice how each color affects your emotional state. Start with calming blue, then energizing yellow, then grounding green.",
+                    "15 minutes"),
+            ),
+            expected_outcome="Students experience how sensory input can directly influence emotional states.",
+        ),
+        Module(
+            module_number=4,
+            concept_explanation="""Before transformation, awareness is required. Many individuals are disconnected from their emotional states. Emotional awareness involves:
 • Identifying what you're feeling
 • Locating the emotion in your body
 • Describing the physical sensation
 • Understanding the message the emotion carries""",
-        "instructor_script": "You can't transform what you can't feel. Emotional awareness is the foundation of all emotional work. Your body holds wisdom that your mind may not yet understand.",
-        "student_activities": [
-            "Practice emotion mapping",
-            "Locate emotions in the body",
-            "Describe physical sensations",
-            "Build body-emotion connection"
-        ],
-        "exercises": [
-            {
-                "name": "Emotion Mapping Exercise",
-                "type": "somatic_awareness",
-                "instructions": "Ask yourself: 'What am I feeling right now?' Locate the emotion in your body. Describe it with texture words (tight, heavy, warm, buzzing, etc.). Notice any colors or images that arise.",
-                "duration": "10 minutes"
-            },
-            {
-                "name": "Body Scan Practice",
-                "type": "mindfulness",
-                "instructions": "Starting from your feet, slowly scan up through your body. Notice any areas of tension, warmth, or sensation. Don't judge, just observe.",
-                "duration": "8 minutes"
-            }
-        ],
-        "expected_outcome": "Students build emotional awareness and body connection, developing the foundation for emotional transformation work."
-    },
-    5: {
-        "concept_explanation": """Multi-Dimensional Eye Movement (MDEM) helps process stuck emotional patterns by engaging neural pathways. Different eye positions access different emotional memories and states.
+            instructor_script="You can't transform what you can't feel. Emotional awareness is the foundation of all emotional work. Your body holds wisdom that your mind may not yet understand.",
+            student_activities=(
+                "Practice emotion mapping",
+                "Locate emotions in the body",
+                "Describe physical sensations",
+                "Build body-emotion connection",
+            ),
+            exercises=(
+                _ex("Emotion Mapping Exercise",
+                    "somatic_awareness",
+                    "Ask yourself: 'What am I feeling right now?' Locate the emotion in your body. Describe it with texture words (tight, heavy, warm, buzzing, etc.). Notice any colors or images that arise.",
+                    "10 minutes"),
+                _ex("Body Scan Practice",
+                    "mindfulness",
+                    "Starting from your feet, slowly scan up through your body. Notice any areas of tension, warmth, or sensation. Don't judge, just observe.",
+                    "8 minutes"),
+            ),
+            expected_outcome="Students build emotional awareness and body connection, developing the foundation for emotional transformation work.",
+        ),
+        Module(
+            module_number=5,
+            concept_explanation="""Multi-Dimensional Eye Movement (MDEM) helps process stuck emotional patterns by engaging neural pathways. Different eye positions access different emotional memories and states.
 
 The technique combines:
 • Specific eye movement patterns
 • Bilateral brain stimulation
 • Emotional targeting
 • Real-time processing""",
-        "instructor_script": "Your eyes are connected directly to your brain's emotional processing centers. By guiding your eye movements, we can access and process emotional material that's been stuck.",
-        "student_activities": [
-            "Follow guided eye movement patterns",
-            "Recall mild emotional memory while moving eyes",
-            "Observe emotional shifts in real-time",
-            "Practice bilateral stimulation"
-        ],
-        "exercises": [
-            {
-                "name": "Basic MDEM Practice",
-                "type": "guided_movement",
-                "instructions": "Think of a mildly uncomfortable memory (not traumatic). Follow the instructor's finger as it moves slowly left to right. Notice any shifts in how the memory feels.",
-                "duration": "12 minutes",
-                "outcome": "Students experience real-time emotional processing"
-            }
-        ],
-        "expected_outcome": "Students experience how eye movements can facilitate emotional processing and reduce emotional intensity."
-    },
-    6: {
-        "concept_explanation": """Stress Response Technique (SRT) uses structured mapping of emotional states to guide intervention. Rather than suppressing emotion, we learn to work with it and redirect it.
+            instructor_script="Your eyes are connected directly to your brain's emotional processing centers. By guiding your eye movements, we can access and process emotional material that's been stuck.",
+            student_activities=(
+                "Follow guided eye movement patterns",
+                "Recall mild emotional memory while moving eyes",
+                "Observe emotional shifts in real-time",
+                "Practice bilateral stimulation",
+            ),
+            exercises=(
+                _ex("Basic MDEM Practice",
+                    "guided_movement",
+                    "Think of a mildly uncomfortable memory (not traumatic). Follow the instructor's finger as it moves slowly left to right. Notice any shifts in how the memory feels.",
+                    "12 minutes",
+                    "Students experience real-time emotional processing"),
+            ),
+            expected_outcome="Students experience how eye movements can facilitate emotional processing and reduce emotional intensity.",
+        ),
+        Module(
+            module_number=6,
+            concept_explanation="""Stress Response Technique (SRT) uses structured mapping of emotional states to guide intervention. Rather than suppressing emotion, we learn to work with it and redirect it.
 
 The process involves:
 • Identifying emotional intensity (1-10 scale)
 • Applying breathing regulation
 • Introducing visual/light stimulus
 • Tracking emotional shift""",
-        "instructor_script": "Emotions are energy in motion. When we resist them, they get stuck. When we work with them skillfully, they can transform naturally.",
-        "student_activities": [
-            "Rate emotional intensity",
-            "Apply breathing techniques",
-            "Track emotional changes",
-            "Practice with partners"
-        ],
-        "exercises": [
-            {
-                "name": "SRT Partner Practice",
-                "type": "paired_exercise",
-                "instructions": "Work in pairs. One person acts as guide, one as participant. Guide: lead your partner through identifying an emotion, rating it 1-10, applying slow breathing, and checking for shifts. Switch roles.",
-                "duration": "20 minutes (10 min each)"
-            },
-            {
-                "name": "Emotional Intensity Tracking",
-                "type": "self_assessment",
-                "instructions": "Choose a current mild emotion. Rate it 1-10. Apply 3 minutes of slow breathing. Re-rate the emotion. Notice any changes.",
-                "duration": "8 minutes"
-            }
-        ],
-        "expected_outcome": "Students learn structured approach to working with emotions and experience emotional regulation techniques."
-    }
-}
+            instructor_script="Emotions are energy in motion. When we resist them, they get stuck. When we work with them skillfully, they can transform naturally.",
+            student_activities=(
+                "Rate emotional intensity",
+                "Apply breathing techniques",
+                "Track emotional changes",
+                "Practice with partners",
+            ),
+            exercises=(
+                _ex("SRT Partner Practice",
+                    "paired_exercise",
+                    "Work in pairs. One person acts as guide, one as participant. Guide: lead your partner through identifying an emotion, rating it 1-10, applying slow breathing, and checking for shifts. Switch roles.",
+                    "20 minutes (10 min each)"),
+                _ex("Emotional Intensity Tracking",
+                    "self_assessment",
+                    "Choose a current mild emotion. Rate it 1-10. Apply 3 minutes of slow breathing. Re-rate the emotion. Notice any changes.",
+                    "8 minutes"),
+            ),
+            expected_outcome="Students learn structured approach to working with emotions and experience emotional regulation techniques.",
+        ),
+    )
+
+
+@cache
+def _index() -> MappingProxyType:
+    return MappingProxyType({m.module_number: m for m in _build()})
+
+
+def get_module(module_number: int) -> Module | None:
+    """Return the detailed content for one module, or None if it has none."""
+    return _index().get(module_number)
+
+
+@cache
+def _flat() -> MappingProxyType:
+    return MappingProxyType({
+        (m.module_number, name): getattr(m, name)
+        for m in _build()
+        for name in _FIELD_NAMES
+    })
+
+
+def get_field(module_number: int, field: str):
+    """Return one field of a module's content, or None if either is unknown."""
+    return _flat().get((module_number, field))
+
+
+def __getattr__(name):
+    if name == "MODULES":
+        return _build()
+    if name == "DETAILED_MODULES":
+        return _index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
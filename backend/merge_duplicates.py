@@ -0,0 +1,117 @@
+"""
+One-off migration: merge duplicate records that block the unique indexes the
+legacy API builds at startup (it logs and skips an index it can't build).
+
+Duplicate users (same email or same id, left by the old check-then-insert
+signup) are merged into the earliest-created account: enrollments, payment
+transactions and module progress are re-pointed to it before the extra
+accounts are deleted.
+
+Duplicate module progress records (same user and module, left by lazy
+creation racing payment completion) are combined into one record that keeps
+the furthest state of each field.
+
+Dry run by default; pass --apply to write. Restart the API afterwards so the
+skipped indexes are built.
+"""
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+
+
+async def _duplicate_groups(collection, keys: list):
+    pipeline = [
+        {"$sort": {"created_at": 1}},
+        {"$group": {"_id": {k: f"${k}" for k in keys}, "docs": {"$push": "$$ROOT"}, "n": {"$sum": 1}}},
+        {"$match": {"n": {"$gt": 1}}}
+    ]
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        yield group["docs"]
+
+
+_PROGRESS_FIELDS = ("is_unlocked", "is_completed", "quiz_attempts", "best_score", "completed_at", "last_attempt_at")
+
+
+def _merged_progress(a: dict, b: dict) -> dict:
+    """Combine two progress records for the same module, keeping the furthest state of each field."""
+    completed_at = [t for t in (a.get("completed_at"), b.get("completed_at")) if t]
+    attempts = [t for t in (a.get("last_attempt_at"), b.get("last_attempt_at")) if t]
+    return {
+        "is_unlocked": bool(a.get("is_unlocked") or b.get("is_unlocked")),
+        "is_completed": bool(a.get("is_completed") or b.get("is_completed")),
+        "quiz_attempts": a.get("quiz_attempts", 0) + b.get("quiz_attempts", 0),
+        "best_score": max(a.get("best_score", 0.0), b.get("best_score", 0.0)),
+        "completed_at": min(completed_at) if completed_at else None,
+        "last_attempt_at": max(attempts) if attempts else None,
+    }
+
+
+async def _move_progress(db, from_user_id: str, to_user_id: str, apply: bool):
+    async for row in db.module_progress.find({"user_id": from_user_id}):
+        existing = await db.module_progress.find_one({"user_id": to_user_id, "module_id": row["module_id"]})
+        if existing:
+            print(f"    merge progress for module {row['module_id']}")
+            if apply:
+                await db.module_progress.update_one(
+                    {"_id": existing["_id"]}, {"$set": _merged_progress(existing, row)}
+                )
+                await db.module_progress.delete_one({"_id": row["_id"]})
+        else:
+            print(f"    move progress for module {row['module_id']}")
+            if apply:
+                await db.module_progress.update_one({"_id": row["_id"]}, {"$set": {"user_id": to_user_id}})
+
+
+async def merge_users(db, apply: bool):
+    for keys in (["email"], ["id"]):
+        async for docs in _duplicate_groups(db.users, keys):
+            keep, extras = docs[0], docs[1:]
+            print(f"users {keys}: keeping {keep['id']} ({keep['email']}), merging {len(extras)}")
+            for extra in extras:
+                if extra["id"] != keep["id"]:
+                    # Rows of an account sharing the keeper's id already point at it
+                    for name in ("enrollments", "payment_transactions"):
+                        n = await db[name].count_documents({"user_id": extra["id"]})
+                        print(f"    re-point {n} {name}")
+                        if apply and n:
+                            await db[name].update_many(
+                                {"user_id": extra["id"]},
+                                {"$set": {"user_id": keep["id"]}}
+                            )
+                    await _move_progress(db, extra["id"], keep["id"], apply)
+                if apply:
+                    await db.users.delete_one({"_id": extra["_id"]})
+
+
+async def merge_progress(db, apply: bool):
+    async for docs in _duplicate_groups(db.module_progress, ["user_id", "module_id"]):
+        keep, extras = docs[0], docs[1:]
+        print(f"module_progress {keep['user_id']}/{keep['module_id']}: merging {len(extras)}")
+        merged = keep
+        for extra in extras:
+            merged = {**merged, **_merged_progress(merged, extra)}
+        if apply:
+            await db.module_progress.update_one(
+                {"_id": keep["_id"]},
+                {"$set": {k: merged[k] for k in _PROGRESS_FIELDS}}
+            )
+            await db.module_progress.delete_many({"_id": {"$in": [d["_id"] for d in extras]}})
+
+
+async def main():
+    apply = "--apply" in sys.argv[1:]
+    mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[os.environ.get('DB_NAME', 'tti_db')]
+
+    await merge_users(db, apply)
+    # After users, so progress moved onto a kept account is merged too
+    await merge_progress(db, apply)
+
+    if not apply:
+        print("Dry run; re-run with --apply to write these changes.")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 import asyncio
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 from datetime import datetime, timezone
 import uuid
 
@@ -118,17 +119,30 @@ async def sync_courses():
         }
     ]
     
-    for c_data in courses_to_add:
-        # We will update existing by title to ensure tracks are correct
-        exists = await db.courses.find_one({'title': c_data['title']})
-        if exists:
-            await db.courses.update_one({'_id': exists['_id']}, {'$set': {'track': c_data['track']}})
-            print(f"Updated Track for: {c_data['title']} -> {c_data['track']}")
-        else:
-            c_data['id'] = str(uuid.uuid4())
-            c_data['created_at'] = datetime.now(timezone.utc).isoformat()
-            await db.courses.insert_one(c_data)
+    # We will update existing by title to ensure tracks are correct; missing
+    # courses are created in full. One upsert per course, sent in one batch
+    now = datetime.now(timezone.utc).isoformat()
+    ops = [
+        UpdateOne(
+            {'title': c_data['title']},
+            {
+                '$set': {'track': c_data['track']},
+                '$setOnInsert': {
+                    **{k: v for k, v in c_data.items() if k not in ('title', 'track')},
+                    'id': str(uuid.uuid4()),
+                    'created_at': now,
+                },
+            },
+            upsert=True
+        )
+        for c_data in courses_to_add
+    ]
+    result = await db.courses.bulk_write(ops, ordered=False)
+    for i, c_data in enumerate(courses_to_add):
+        if i in result.upserted_ids:
             print(f"Created and assigned: {c_data['title']} to {c_data['track']}")
+        else:
+            print(f"Updated Track for: {c_data['title']} -> {c_data['track']}")
 
 if __name__ == "__main__":
     asyncio.run(sync_courses())
@@ -1,4 +1,9 @@
+import asyncio
+import hashlib
+import logging
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,13 +15,26 @@ import os
 from backend.db_client import noco
 
 router = APIRouter(prefix="/api/auth")
+logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 JWT_SECRET = os.environ.get('JWT_SECRET_KEY', 'tti_secret_key_2024')
 JWT_ALGORITHM = "HS256"
+# Our tokens always carry these; a token without them is rejected as invalid
+# instead of failing later on a missing key
+JWT_DECODE_OPTIONS = {"require": ["exp", "user_id"]}
 JWT_EXPIRATION_HOURS = 24
+JWT_EXPIRATION_SECONDS = JWT_EXPIRATION_HOURS * 3600
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '10'))
+BCRYPT_MAX_PENDING = int(os.environ.get('BCRYPT_MAX_PENDING', '64'))
+BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', str(min(8, os.cpu_count() or 1))))
 
-from datetime import timedelta
+# Verified token -> user cache, so repeat requests with the same bearer token
+# skip the JWT verify and the NocoDB user lookup. Entries never outlive the
+# token's own exp claim.
+USER_CACHE_TTL_SECONDS = int(os.environ.get('USER_CACHE_TTL_SECONDS', '30'))   # 0 disables the cache
+USER_CACHE_MAX_ENTRIES = 10000
+_user_cache: dict = {}   # sha256(token) -> (expires_at, user)
 
 
 class UserCreate(BaseModel):
@@ -40,34 +58,81 @@ class TokenResponse(BaseModel):
     user: UserResponse
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+# bcrypt is deliberately slow (~75 ms per hash at the default BCRYPT_ROUNDS of
+# 10, 4x that at 12), so hashing runs in a worker pool to keep the event loop
+# serving other requests meanwhile. bcrypt releases the GIL while hashing, so
+# its own pool of one thread per CPU (BCRYPT_WORKERS, capped at 8 by default)
+# hashes in parallel without competing with the loop's default executor.
+# Once BCRYPT_MAX_PENDING hashes are queued, further callers get a 503 rather
+# than waiting behind a login burst.
+_bcrypt_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_bcrypt_pending = 0
+
+async def _run_bcrypt(fn, *args):
+    global _bcrypt_pending
+    if _bcrypt_pending >= BCRYPT_MAX_PENDING:
+        raise HTTPException(status_code=503, detail="Server busy, please retry",
+                            headers={"Retry-After": "1"})
+    _bcrypt_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, fn, *args)
+    finally:
+        _bcrypt_pending -= 1
+
+async def hash_password(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    hashed = await _run_bcrypt(bcrypt.hashpw, password.encode(), salt)
+    return hashed.decode()
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run_bcrypt(bcrypt.checkpw, password.encode(), hashed.encode())
+
+def needs_rehash(hashed: str) -> bool:
+    """
+    True if a stored hash ('$2b$<cost>$...') is weaker than BCRYPT_ROUNDS.
+    Stronger hashes are kept: lowering the setting never downgrades them.
+    """
+    try:
+        return int(hashed.split("$")[2]) < BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
 
 def create_token(user_id: str, email: str) -> str:
-    from datetime import timedelta
     payload = {
         "user_id": user_id,
         "email": email,
-        "exp": datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
+        "exp": int(time.time()) + JWT_EXPIRATION_SECONDS
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+    cached = _user_cache.get(key)
+    if cached:
+        if cached[0] > now:
+            return cached[1]
+        _user_cache.pop(key, None)
+
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user = await noco.find_one("users", f"(userid,eq,{payload['user_id']})")
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM], options=JWT_DECODE_OPTIONS)
+        # Only the profile columns — keeps the password hash out of the cache
+        user = await noco.find_one("users", f"(userid,eq,{payload['user_id']})",
+                                   fields="Id,userid,email,name,created")
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
-        return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    if USER_CACHE_TTL_SECONDS > 0:
+        if len(_user_cache) >= USER_CACHE_MAX_ENTRIES:
+            _user_cache.clear()
+        _user_cache[key] = (min(now + USER_CACHE_TTL_SECONDS, payload["exp"]), user)
+    return user
+
 
 @router.post("/signup", response_model=TokenResponse)
 async def signup(user_data: UserCreate):
@@ -80,12 +145,12 @@ async def signup(user_data: UserCreate):
         "userid": user_id,
         "email": user_data.email,
         "name": user_data.name,
-        "password": hash_password(user_data.password),
+        "password": await hash_password(user_data.password),
         # 'created' is auto-generated by NocoDB — do not send it
     }
 
     result = await noco.insert_one("users", user_doc)
-    created_at = result.get("created", datetime.now(timezone.utc).isoformat())
+    created_at = result.get("created") or datetime.now(timezone.utc).isoformat()
     token = create_token(user_id, user_data.email)
     return TokenResponse(
         access_token=token,
@@ -96,9 +161,17 @@ async def signup(user_data: UserCreate):
 @router.post("/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await noco.find_one("users", f"(email,eq,{credentials.email})")
-    if not user or not verify_password(credentials.password, user.get("password", "")):
+    if not user or not await verify_password(credentials.password, user.get("password", "")):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
+    # Migrate hashes made at an older cost factor while we have the password;
+    # this only saves future cost, so a failure must never block the login
+    if needs_rehash(user["password"]):
+        try:
+            await noco.update_by_id("users", user["Id"], {"password": await hash_password(credentials.password)})
+        except Exception as e:
+            logger.warning(f"Password rehash failed for user {user['userid']}: {e}")
+
     token = create_token(user["userid"], user["email"])
     return TokenResponse(
         access_token=token,
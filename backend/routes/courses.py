@@ -1,5 +1,6 @@
 import uuid
 import json
+import time
 from datetime import datetime, timezone
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
@@ -18,19 +19,53 @@ def _normalize(course: dict) -> dict:
     return course
 
 
+# ── Catalogue cache ──────────────────────────────────────────────────────────
+# The course list only changes when a course is created, so it is kept
+# in-process for a short TTL instead of hitting NocoDB on every page view.
+CATALOG_TTL_SECONDS = 60
+_catalog: list = []
+_catalog_by_id: dict = {}
+_catalog_expires = 0.0
+
+
+async def get_catalog() -> list:
+    """Return all courses (normalized), from the in-process cache when fresh."""
+    global _catalog, _catalog_by_id, _catalog_expires
+    now = time.monotonic()
+    if now < _catalog_expires:
+        return _catalog
+    courses = [_normalize(c) for c in await noco.get_all("Courses", params={"limit": 100})]
+    # get_all returns [] on NocoDB errors — don't pin that for a whole TTL
+    if courses:
+        _catalog = courses
+        _catalog_by_id = {c.get("course_id"): c for c in courses}
+        _catalog_expires = now + CATALOG_TTL_SECONDS
+    return courses
+
+
+def invalidate_catalog():
+    global _catalog_expires
+    _catalog_expires = 0.0
+
+
 @router.get("")
 async def get_courses(track: Optional[str] = None):
-    courses = await noco.get_all("Courses", params={"limit": 100})
+    courses = await get_catalog()
     if track:
         # 'both' track courses appear in both wellness and clinical
         courses = [c for c in courses if c.get("track") in (track, "both")]
-    courses = [_normalize(c) for c in courses]
-    courses.sort(key=lambda c: 1 if c.get("is_coming_soon") else 0)
-    return courses
+    return sorted(courses, key=lambda c: 1 if c.get("is_coming_soon") else 0)
 
 
 @router.get("/{course_id}")
 async def get_course(course_id: str):
+    await get_catalog()
+    # Only trust the by-id index while the catalogue is fresh: a failed or
+    # empty refresh leaves the previous load's entries in it
+    if time.monotonic() < _catalog_expires:
+        course = _catalog_by_id.get(course_id)
+        if course:
+            return course
     course = await noco.find_one("Courses", f"(course_id,eq,{course_id})")
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
@@ -59,4 +94,5 @@ async def create_course(course_data: dict):
         **course_data,
     }
     result = await noco.insert_one("Courses", doc)
+    invalidate_catalog()
     return _normalize(result)
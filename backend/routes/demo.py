@@ -1,4 +1,5 @@
 """Demo enrollment endpoint — skips Stripe, creates a paid enrollment directly."""
+import asyncio
 import json
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
@@ -15,17 +16,19 @@ class DemoEnrollRequest(BaseModel):
 @router.post("/enroll")
 async def demo_enroll(data: DemoEnrollRequest, user: dict = Depends(get_current_user)):
     """Create a paid enrollment directly (demo mode — no Stripe)."""
-    course = await noco.find_one("Courses", f"(course_id,eq,{data.course_id})")
+    user_id = user["userid"]
+
+    # Course lookup and already-enrolled check are independent — run them together
+    course, existing = await asyncio.gather(
+        noco.find_one("Courses", f"(course_id,eq,{data.course_id})"),
+        noco.find_one("enrollments",
+            f"(userid,eq,{user_id})~and(course_id,eq,{data.course_id})~and(payment_status,eq,paid)",
+            fields="Id"),
+    )
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     if course.get("is_coming_soon"):
         raise HTTPException(status_code=400, detail="Course not yet available")
-
-    user_id = user["userid"]
-
-    # Check if already enrolled
-    existing = await noco.find_one("enrollments",
-        f"(userid,eq,{user_id})~and(course_id,eq,{data.course_id})~and(payment_status,eq,paid)")
     if existing:
         raise HTTPException(status_code=400, detail="Already enrolled in this course")
 
@@ -10,6 +10,7 @@ Sandbox/demo mode
 • Leave STRIPE_API_KEY empty or as placeholder to use built-in mock checkout
   (auto-confirms after redirect — great for demos without a Stripe account).
 """
+import asyncio
 import json
 import os
 import uuid
@@ -46,22 +47,30 @@ class CheckoutRequest(BaseModel):
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
-async def _get_course(course_id: str) -> dict:
-    course = await noco.find_one("Courses", f"(course_id,eq,{course_id})")
+async def _get_enrollable_course(user_id: str, course_id: str) -> dict:
+    """
+    Fetch the course and check the user isn't already enrolled in it.
+    Both lookups are independent, so they run concurrently.
+    """
+    course, existing = await asyncio.gather(
+        noco.find_one(
+            "Courses",
+            f"(course_id,eq,{course_id})",
+            fields="course_id,title,description,price,is_coming_soon",
+        ),
+        noco.find_one(
+            "enrollments",
+            f"(userid,eq,{user_id})~and(course_id,eq,{course_id})~and(payment_status,eq,paid)",
+            fields="Id",
+        ),
+    )
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     if course.get("is_coming_soon"):
         raise HTTPException(status_code=400, detail="This course is not yet available")
-    return course
-
-
-async def _check_already_enrolled(user_id: str, course_id: str):
-    existing = await noco.find_one(
-        "enrollments",
-        f"(userid,eq,{user_id})~and(course_id,eq,{course_id})~and(payment_status,eq,paid)"
-    )
     if existing:
         raise HTTPException(status_code=400, detail="Already enrolled in this course")
+    return course
 
 
 async def _create_pending_enrollment(user_id: str, course_id: str, session_id: str):
@@ -89,11 +98,22 @@ async def get_my_enrollments(user: dict = Depends(get_current_user)):
         "limit": 100,
     })
 
+    # One batched lookup for every enrolled course instead of one per row
+    course_ids = {e.get("course_id", "") for e in enrollments}
+    courses = {}
+    if course_ids:
+        rows = await noco.get_all("Courses", params={
+            "where": "~or".join(f"(course_id,eq,{cid})" for cid in course_ids),
+            "fields": "course_id,title,track,level,schedule,location",
+            "limit": len(course_ids),
+        })
+        for c in rows:
+            c["id"] = c.get("course_id", "")
+            courses[c["id"]] = c
+
     result = []
     for enrollment in enrollments:
-        course = await noco.find_one("Courses", f"(course_id,eq,{enrollment.get('course_id', '')})")
-        if course:
-            course["id"] = course.get("course_id", "")
+        course = courses.get(enrollment.get("course_id", ""))
 
         progress = json.loads(enrollment.get("progress_data") or "{}")
         content  = COURSE_CONTENT.get(enrollment.get("course_id", ""), {"modules": []})
@@ -121,10 +141,8 @@ async def create_checkout(
     Create a Stripe Checkout Session (real or mock).
     Returns { checkout_url, session_id }.
     """
-    course   = await _get_course(checkout_data.course_id)
     user_id  = user["userid"]
-
-    await _check_already_enrolled(user_id, checkout_data.course_id)
+    course   = await _get_enrollable_course(user_id, checkout_data.course_id)
 
     price_inr    = int(float(course.get("price", 0)))
     amount_paise = price_inr * 100   # Stripe INR uses paise (1 INR = 100 paise)
@@ -135,7 +153,12 @@ async def create_checkout(
     # ── Real Stripe ──────────────────────────────────────────────────────────
     if STRIPE_AVAILABLE:
         try:
-            session = stripe.checkout.Session.create(
+            # stripe's _async methods share one process-wide HTTP client bound
+            # to the first event loop that used it, which breaks when each
+            # serverless invocation gets a fresh loop; run the blocking call in
+            # a worker thread instead so the event loop stays free
+            session = await asyncio.to_thread(
+                stripe.checkout.Session.create,
                 payment_method_types=["card"],
                 line_items=[{
                     "price_data": {
@@ -4,8 +4,7 @@ Quiz questions are served from backend/course_content.py.
 Progress is stored as JSON inside enrollments.progress_data.
 """
 import json
-import os
-import httpx
+from functools import cache
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List
@@ -16,9 +15,6 @@ from backend.course_content import COURSE_CONTENT
 
 router = APIRouter(prefix="/api/courses")
 
-NOCODB_TABLE_ENROLLMENTS = os.environ.get('NOCODB_TABLE_ENROLLMENTS', '')
-BASE = "https://app.nocodb.com/api/v2/tables"
-
 
 class QuizSubmission(BaseModel):
     module_number: int = 0   # optional — already in URL path
@@ -26,6 +22,27 @@ class QuizSubmission(BaseModel):
 
 
 
+# COURSE_CONTENT is static, so module lookups and quiz answer keys are built
+# once on first use instead of scanning the module list on every request.
+@cache
+def _module_index() -> dict:
+    return {
+        (course_id, mod["module_number"]): mod
+        for course_id, content in COURSE_CONTENT.items()
+        for mod in content["modules"]
+    }
+
+
+def _get_module(course_id: str, module_number: int) -> dict | None:
+    return _module_index().get((course_id, module_number))
+
+
+@cache
+def _answer_key(course_id: str, module_number: int) -> tuple:
+    """Correct option index per question, in quiz order."""
+    return tuple(q["correct_answer"] for q in _get_module(course_id, module_number).get("quiz", []))
+
+
 async def _get_enrollment_row(user_id: str, course_id: str) -> dict | None:
     """Fetch the paid enrollment row for a user+course."""
     return await noco.find_one("enrollments",
@@ -34,12 +51,7 @@ async def _get_enrollment_row(user_id: str, course_id: str) -> dict | None:
 
 async def _update_enrollment_progress(row_nocodb_id: int, progress: dict):
     """Patch progress_data JSON on the enrollment row."""
-    token = os.environ.get('NOCODB_TOKEN', '')
-    table_id = os.environ.get('NOCODB_TABLE_ENROLLMENTS', '')
-    url = f"{BASE}/{table_id}/records/{row_nocodb_id}"
-    headers = {"xc-token": token, "Content-Type": "application/json"}
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        await client.patch(url, headers=headers, json={"progress_data": json.dumps(progress)})
+    await noco.update_by_id("enrollments", row_nocodb_id, {"progress_data": json.dumps(progress)})
 
 
 @router.get("/{course_id}/modules")
@@ -80,8 +92,7 @@ async def get_module_detail(course_id: str, module_number: int, user: dict = Dep
     if not enrollment:
         raise HTTPException(status_code=403, detail="Not enrolled in this course")
 
-    content = COURSE_CONTENT.get(course_id, {"modules": []})
-    mod = next((m for m in content["modules"] if m["module_number"] == module_number), None)
+    mod = _get_module(course_id, module_number)
     if not mod:
         raise HTTPException(status_code=404, detail="Module not found")
 
@@ -96,8 +107,7 @@ async def get_module_quiz(course_id: str, module_number: int, user: dict = Depen
     if not enrollment:
         raise HTTPException(status_code=403, detail="Not enrolled")
 
-    content = COURSE_CONTENT.get(course_id, {"modules": []})
-    mod = next((m for m in content["modules"] if m["module_number"] == module_number), None)
+    mod = _get_module(course_id, module_number)
     if not mod:
         raise HTTPException(status_code=404, detail="Module not found")
 
@@ -113,25 +123,13 @@ async def submit_quiz(course_id: str, module_number: int, submission: QuizSubmis
     user_id = user["userid"]
 
     # Get enrollment with the NocoDB row Id
-    token = os.environ.get('NOCODB_TOKEN', '')
-    table_id = os.environ.get('NOCODB_TABLE_ENROLLMENTS', '')
-    headers = {"xc-token": token, "Content-Type": "application/json"}
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.get(
-            f"{BASE}/{table_id}/records",
-            headers=headers,
-            params={"where": f"(userid,eq,{user_id})~and(course_id,eq,{course_id})~and(payment_status,eq,paid)"}
-        )
-        rows = resp.json().get("list", [])
-        if not rows:
-            raise HTTPException(status_code=403, detail="Not enrolled")
-        row = rows[0]
-        row_id = row.get("Id") or row.get("id")
+    row = await _get_enrollment_row(user_id, course_id)
+    if not row:
+        raise HTTPException(status_code=403, detail="Not enrolled")
+    row_id = row.get("Id") or row.get("id")
 
     # Grade the quiz
-    content = COURSE_CONTENT.get(course_id, {"modules": []})
-    mod = next((m for m in content["modules"] if m["module_number"] == module_number), None)
+    mod = _get_module(course_id, module_number)
     if not mod:
         raise HTTPException(status_code=404, detail="Module not found")
 
@@ -141,7 +139,9 @@ async def submit_quiz(course_id: str, module_number: int, submission: QuizSubmis
     if len(submission.answers) != len(questions):
         raise HTTPException(status_code=400, detail="Answer count mismatch")
 
-    correct = sum(1 for i, q in enumerate(questions) if submission.answers[i] == q["correct_answer"])
+    # Grade each answer once; the count and the review both reuse it
+    is_correct = [a == c for a, c in zip(submission.answers, _answer_key(course_id, module_number))]
+    correct = sum(is_correct)
     score = correct / len(questions)
     passed = score >= 0.8
 
@@ -164,11 +164,11 @@ async def submit_quiz(course_id: str, module_number: int, submission: QuizSubmis
         "review": [
             {
                 "question": q["question"],
-                "your_answer": q["options"][submission.answers[i]],
+                "your_answer": q["options"][a],
                 "correct_answer": q["options"][q["correct_answer"]],
-                "is_correct": submission.answers[i] == q["correct_answer"],
+                "is_correct": ok,
                 "explanation": q.get("explanation", "")
             }
-            for i, q in enumerate(questions)
+            for q, a, ok in zip(questions, submission.answers, is_correct)
         ]
     }
@@ -9,9 +9,11 @@ Sandbox/demo mode
 • Mock session IDs (prefix "mock_"): auto-confirmed as paid for demo purposes.
 • Webhook endpoint remains active; register it in Stripe Dashboard for production.
 """
+import asyncio
 import json
 import os
 import logging
+import time
 
 import stripe
 
@@ -35,6 +37,12 @@ STRIPE_AVAILABLE = _is_real_stripe_key(STRIPE_API_KEY)
 if STRIPE_AVAILABLE:
     stripe.api_key = STRIPE_API_KEY
 
+# Stripe redelivers events it isn't sure we received; recently handled event
+# ids are remembered so a redelivery is acknowledged without redoing the work.
+WEBHOOK_DEDUP_TTL_SECONDS = 24 * 3600
+WEBHOOK_DEDUP_MAX_ENTRIES = 10000
+_handled_events: dict = {}   # event id -> expires_at
+
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -87,8 +95,8 @@ async def get_payment_status(session_id: str, user: dict = Depends(get_current_u
         )
 
     try:
-        stripe.api_key = STRIPE_API_KEY
-        session = stripe.checkout.Session.retrieve(session_id)
+        # In a worker thread rather than retrieve_async; see enrollments.create_checkout
+        session = await asyncio.to_thread(stripe.checkout.Session.retrieve, session_id)
     except stripe.StripeError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -116,7 +124,6 @@ async def stripe_webhook(request: Request):
 
     if STRIPE_WEBHOOK_SECRET:
         try:
-            stripe.api_key = STRIPE_API_KEY
             event = stripe.Webhook.construct_event(payload, sig_header, STRIPE_WEBHOOK_SECRET)
         except stripe.SignatureVerificationError:
             raise HTTPException(status_code=400, detail="Invalid webhook signature")
@@ -128,7 +135,12 @@ async def stripe_webhook(request: Request):
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
+    event_id   = event.get("id", "")
     event_type = event.get("type", "")
+    now = time.time()
+    if _handled_events.get(event_id, 0) > now:
+        logger.info(f"Stripe webhook event {event_id} already handled")
+        return Response(content='{"received":true}', media_type="application/json")
     logger.info(f"Stripe webhook event: {event_type}")
 
     if event_type == "checkout.session.completed":
@@ -138,4 +150,9 @@ async def stripe_webhook(request: Request):
         if pmt_status == "paid":
             await _mark_enrollment_paid(session_id)
 
+    if event_id:
+        if len(_handled_events) >= WEBHOOK_DEDUP_MAX_ENTRIES:
+            _handled_events.clear()
+        _handled_events[event_id] = now + WEBHOOK_DEDUP_TTL_SECONDS
+
     return Response(content='{"received":true}', media_type="application/json")
@@ -294,16 +294,18 @@ async def seed_clinical_curriculum():
         course_id = course['id']
         await db.modules.delete_many({"course_id": course_id})
         
+        now = datetime.now(timezone.utc).isoformat()
         for mod in modules:
             mod["course_id"] = course_id
             mod["id"] = str(uuid.uuid4())
             mod["week"] = mod["module_number"] # Using module number as week for now
-            mod["created_at"] = datetime.now(timezone.utc).isoformat()
+            mod["created_at"] = now
             mod["assessment"] = {
                 "quiz_questions": [],
                 "passing_score": 0.8
             }
-            await db.modules.insert_one(mod)
+        # One round trip for the course's modules instead of one per module
+        await db.modules.insert_many(modules, ordered=False)
         
         print(f"Successfully seeded {len(modules)} clinical modules for '{course_title}'")
 
@@ -160,18 +160,24 @@ async def seed():
     print(f"Seeding {len(COURSES)} courses to NocoDB...\n")
     async with httpx.AsyncClient(timeout=30.0) as client:
         # First check existing courses to avoid duplicates
-        resp = await client.get(URL, headers=headers, params={"limit": 100})
+        resp = await client.get(URL, headers=headers, params={"limit": 100, "fields": "title"})
         existing_titles = {r.get("title") for r in resp.json().get("list", [])}
 
+        new_courses = []
         for course in COURSES:
             if course["title"] in existing_titles:
                 print(f"⏭️  Skipped (already exists): {course['title']}")
-                continue
-            resp = await client.post(URL, headers=headers, json=course)
+            else:
+                new_courses.append(course)
+
+        # NocoDB accepts a list of records, so every new course goes in one request
+        if new_courses:
+            resp = await client.post(URL, headers=headers, json=new_courses)
             if resp.status_code in [200, 201]:
-                print(f"✅ Inserted: {course['title']}")
+                for course in new_courses:
+                    print(f"✅ Inserted: {course['title']}")
             else:
-                print(f"❌ Failed ({resp.status_code}): {course['title']} — {resp.text}")
+                print(f"❌ Failed ({resp.status_code}): {len(new_courses)} courses — {resp.text}")
 
     print("\n✅ Done! Check your NocoDB Courses table.")
 
@@ -211,16 +211,18 @@ async def seed_wellness_and_utility_modules():
         # Clear old modules for this course to ensure clean seed
         await db.modules.delete_many({"course_id": course_id})
         
+        now = datetime.now(timezone.utc).isoformat()
         for mod in modules:
             mod["course_id"] = course_id
             mod["id"] = str(uuid.uuid4())
             mod["week"] = 1 # Default week or distributed
-            mod["created_at"] = datetime.now(timezone.utc).isoformat()
+            mod["created_at"] = now
             mod["assessment"] = {
                 "quiz_questions": [],
                 "passing_score": 0.8
             }
-            await db.modules.insert_one(mod)
+        # One round trip for the course's modules instead of one per module
+        await db.modules.insert_many(modules, ordered=False)
         
         print(f"Successfully seeded {len(modules)} modules for '{course_title}'")
 
@@ -3,7 +3,8 @@ import logging
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 
 from backend.routes import auth, courses, enrollments, modules, payments, demo
@@ -14,18 +15,35 @@ load_dotenv(_here / '.env')           # backend/.env
 load_dotenv(_here.parent / '.env')    # project root .env (fallback)
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
+# basicConfig is a no-op when the server (e.g. uvicorn) has already set up the
+# root logger; it only applies where nothing else does, such as on Vercel.
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger(__name__)
+# Health probes hit every few seconds; keep them out of the access log
+logging.getLogger("uvicorn.access").addFilter(lambda r: "/api/health" not in r.getMessage())
 
 # ─── App ─────────────────────────────────────────────────────────────────────
-app = FastAPI(title="Trauma Transformation Institute API")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Origins are parsed once here from CORS_ORIGINS (comma-separated, default "*").
+# Auth uses a bearer header, not cookies, so credentials are only enabled for
+# an explicit origin list — with "*" Starlette would otherwise have to echo
+# each request's Origin back.
+CORS_ORIGINS = [o.strip() for o in os.environ.get('CORS_ORIGINS', '*').split(',') if o.strip()] or ["*"]
+
+# orjson encodes the plain-dict responses most routes return much faster than
+# the stdlib json encoder behind the default JSONResponse. The middleware list
+# is fixed at construction, so the stack is final before the first request.
+app = FastAPI(
+    title="Trauma Transformation Institute API",
+    default_response_class=ORJSONResponse,
+    middleware=[
+        Middleware(
+            CORSMiddleware,
+            allow_origins=CORS_ORIGINS,
+            allow_credentials="*" not in CORS_ORIGINS,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        ),
+    ],
 )
 
 # ─── Routes ──────────────────────────────────────────────────────────────────
@@ -48,11 +66,19 @@ async def health_check():
     except Exception as e:
         return {"status": "unhealthy", "error": str(e)}
 
+# Liveness probe: no NocoDB round trip and no JSON, just a prebuilt 200.
+# /api/health above stays the readiness check.
+_LIVENESS_RESPONSE = PlainTextResponse("ok")
+
+@app.get("/api/healthz", response_class=PlainTextResponse)
+async def liveness():
+    return _LIVENESS_RESPONSE
+
 # ─── Global error handler ─────────────────────────────────────────────────────
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled error: {exc}", exc_info=True)
-    return JSONResponse(status_code=500,
+    return ORJSONResponse(status_code=500,
         content={"detail": "Internal Server Error", "error": str(exc)})
 
 # ─── Startup log ─────────────────────────────────────────────────────────────
@@ -61,3 +87,8 @@ async def startup():
     logger.info("Server started")
     logger.info(f"NOCODB_URL set: {'YES' if os.environ.get('NOCODB_URL') else 'NO'}")
     logger.info(f"NOCODB_TOKEN set: {'YES' if os.environ.get('NOCODB_TOKEN') else 'NO'}")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await noco.aclose()
@@ -117,15 +117,22 @@ async def sync_courses():
         }
     ]
     
+    # Look up which titles already exist in one query, then insert the rest in one batch
+    existing = await db.courses.distinct('title', {'title': {'$in': [c['title'] for c in new_courses]}})
+    existing = set(existing)
+    now = datetime.now(timezone.utc).isoformat()
+    to_insert = []
     for c_data in new_courses:
-        exists = await db.courses.find_one({'title': c_data['title']})
-        if not exists:
+        if c_data['title'] not in existing:
             c_data['id'] = str(uuid.uuid4())
-            c_data['created_at'] = datetime.now(timezone.utc).isoformat()
-            await db.courses.insert_one(c_data)
-            print(f"Created: {c_data['title']}")
+            c_data['created_at'] = now
+            to_insert.append(c_data)
         else:
             print(f"Exists: {c_data['title']}")
+    if to_insert:
+        await db.courses.insert_many(to_insert, ordered=False)
+        for c_data in to_insert:
+            print(f"Created: {c_data['title']}")
 
 if __name__ == "__main__":
     asyncio.run(sync_courses())